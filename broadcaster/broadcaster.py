@@ -1,10 +1,16 @@
 import os
+import time
 import asyncio
 import json
 import nats
 import aiohttp
 import logging
 
+try:
+    import msgpack
+except ImportError:  # only needed when publishers send msgpack bodies
+    msgpack = None
+
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s %(message)s"
 logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
@@ -20,18 +26,104 @@ SUBJECT=f"{namespace}.todos.>"
 QUEUE_GROUP = f"{namespace}-broadcaster-workers"
 logger.info(f"SUBJECT: {SUBJECT}, QUEUE_GROUP: {QUEUE_GROUP}")
 
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+# Positional field order of msgpack events, per schema version; must match
+# todo_backend/app/nats_client.py
+ENVELOPE_FIELDS = ("v", "id", "type", "ts", "data")
+TODO_FIELDS = {1: ("id", "text", "completed", "created_at")}
+
+
+class TodoEvent:
+    """Lazily decoded view of a todo event message.
+
+    The publisher picks the body encoding; a "Content-Type:
+    application/msgpack" header marks positional msgpack bodies, and its
+    absence means JSON. The body is only decoded the first time a field is
+    needed. JSON bodies without a "v" key are legacy bare todo payloads.
+    """
+
+    def __init__(self, msg: nats.aio.client.Msg):
+        self.msg = msg
+        self._envelope = None
+
+    @property
+    def content_type(self) -> str:
+        headers = self.msg.headers or {}
+        return headers.get("Content-Type", CONTENT_TYPE_JSON).split(";", 1)[0].strip()
+
+    @property
+    def envelope(self) -> dict:
+        if self._envelope is None:
+            if self.content_type == CONTENT_TYPE_MSGPACK:
+                if msgpack is None:
+                    raise ValueError("msgpack event received but msgpack is not installed")
+                packed = msgpack.unpackb(self.msg.data, timestamp=3)
+                if not isinstance(packed, list) or len(packed) != len(ENVELOPE_FIELDS):
+                    raise ValueError(f"malformed msgpack envelope: {packed!r:.80}")
+                decoded = dict(zip(ENVELOPE_FIELDS, packed))
+                fields = TODO_FIELDS.get(decoded["v"])
+                if fields is None:
+                    raise ValueError(f"unsupported event schema version {decoded['v']!r}")
+                if not isinstance(decoded["data"], list) or len(decoded["data"]) != len(fields):
+                    raise ValueError(f"malformed v{decoded['v']} todo payload")
+                decoded["data"] = dict(zip(fields, decoded["data"]))
+            else:
+                decoded = json.loads(self.msg.data)
+            if not isinstance(decoded, dict) or "v" not in decoded:
+                # Legacy publisher: body is the bare todo payload
+                decoded = {"v": 0, "data": decoded}
+            self._envelope = decoded
+        return self._envelope
+
+    @property
+    def id(self) -> str | None:
+        event_id = self.envelope.get("id")
+        # msgpack carries the raw 16-byte uuid
+        return event_id.hex() if isinstance(event_id, bytes) else event_id
+
+    @property
+    def type(self) -> str | None:
+        return self.envelope.get("type")
+
+    @property
+    def version(self) -> int:
+        return self.envelope["v"]
+
+    @property
+    def data(self):
+        return self.envelope.get("data")
+
+    @property
+    def lag(self) -> float | None:
+        """Seconds between publish and now, if the publisher stamped it."""
+        ts = self.envelope.get("ts")
+        return time.time() - ts if ts is not None else None
+
+
 async def message_handler(msg: nats.aio.client.Msg, slack_webhook_url=None):
-    
-    try:
-        data_str = msg.data.decode("utf-8")
-    except UnicodeDecodeError:
-        data_str = repr(msg.data)
+    event = TodoEvent(msg)
+    # Always logs; subject, header and size only, so the body stays undecoded
+    logger.info(f"subject={msg.subject} encoding={event.content_type} bytes={len(msg.data)}")
 
-    # Always logs
-    logger.info(f"subject={msg.subject} data={data_str}")
+    try:
+        if logger.isEnabledFor(logging.DEBUG):
+            lag = event.lag
+            lag_str = f"{lag * 1000:.1f}ms" if lag is not None else "n/a"
+            logger.debug(
+                f"subject={msg.subject} id={event.id} type={event.type} v={event.version} "
+                f"lag={lag_str} data={event.data}"
+            )
+        if not slack_webhook_url:
+            return
+        data_str = json.dumps(event.data, default=str)
+    except (ValueError, TypeError) as e:
+        # Don't drop the event: forward what we have so it is still visible
+        logger.error(f"subject={msg.subject} undecodable event ({event.content_type}): {e}")
+        data_str = f"<undecodable {event.content_type} payload, {len(msg.data)} bytes>"
 
     if slack_webhook_url:
-        # Include the full JSON payload in the Slack message
+        # Include the full todo payload in the Slack message
         text = f"Todo event on {msg.subject}:\n{data_str}"
         async with aiohttp.ClientSession() as session:
             await session.post(slack_webhook_url, json={"text": text})
@@ -0,0 +1,91 @@
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+import msgpack
+import pytest
+import broadcaster
+from broadcaster import TodoEvent, message_handler
+
+MSGPACK_HEADERS = {"Content-Type": broadcaster.CONTENT_TYPE_MSGPACK}
+TODO = {
+    "id": 1,
+    "text": "Buy groceries",
+    "completed": False,
+    "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+}
+
+
+class FakeMsg:
+    def __init__(self, data: bytes, headers=None, subject="default.todos.created"):
+        self.data = data
+        self.headers = headers
+        self.subject = subject
+
+
+def msgpack_event(*envelope):
+    return FakeMsg(msgpack.packb(list(envelope), datetime=True), MSGPACK_HEADERS)
+
+
+def test_decodes_msgpack_envelope():
+    event_id = uuid.uuid4()
+    ts = time.time()
+    fields = broadcaster.TODO_FIELDS[1]
+    event = TodoEvent(msgpack_event(1, event_id.bytes, "todo.created", ts, [TODO[f] for f in fields]))
+
+    assert event.content_type == broadcaster.CONTENT_TYPE_MSGPACK
+    assert event.id == event_id.hex
+    assert event.type == "todo.created"
+    assert event.version == 1
+    assert event.data == TODO
+    assert event.lag >= 0
+
+
+def test_decodes_json_envelope_and_legacy_payload():
+    body = {"v": 1, "id": "abc", "type": "todo.updated", "ts": time.time(), "data": {"id": 1}}
+    event = TodoEvent(FakeMsg(json.dumps(body).encode()))
+    assert event.content_type == broadcaster.CONTENT_TYPE_JSON
+    assert (event.id, event.type, event.data) == ("abc", "todo.updated", {"id": 1})
+
+    legacy = TodoEvent(FakeMsg(b'{"id": 1, "text": "legacy"}'))
+    assert legacy.version == 0
+    assert legacy.data == {"id": 1, "text": "legacy"}
+    assert legacy.lag is None
+
+
+@pytest.mark.parametrize("msg", [
+    msgpack_event(1, b"\x00" * 16, "todo.created"),
+    msgpack_event(1, b"", None, None, [1]),
+    msgpack_event(9, b"", None, None, []),
+    FakeMsg(msgpack.packb({"v": 1}), MSGPACK_HEADERS),
+    FakeMsg(b"\xff"),
+])
+def test_malformed_events_raise_value_error(msg):
+    with pytest.raises(ValueError):
+        TodoEvent(msg).envelope
+
+
+def test_body_decoded_lazily_and_only_once():
+    event = TodoEvent(FakeMsg(b'{"v": 1, "id": "abc", "data": {}}'))
+    assert event._envelope is None
+    assert event.id == "abc"
+    envelope = event._envelope
+    assert event.data == {}
+    assert event._envelope is envelope
+
+
+@pytest.mark.asyncio
+async def test_handler_does_not_decode_without_webhook(monkeypatch, caplog):
+    caplog.set_level(logging.INFO, logger=broadcaster.logger.name)
+    decoded = []
+    monkeypatch.setattr(TodoEvent, "envelope", property(lambda self: decoded.append(self) or {}))
+    await message_handler(FakeMsg(b'{"v": 1}'))
+    assert decoded == []
+
+
+@pytest.mark.asyncio
+async def test_handler_survives_malformed_events():
+    # Must not raise out of the NATS callback
+    await message_handler(msgpack_event(1, b"\x00" * 16, "todo.created"))
+    await message_handler(FakeMsg(b"\xff"))
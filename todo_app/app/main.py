@@ -1,7 +1,6 @@
 import logging
 import os
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from app.routes import frontend
 
@@ -18,8 +17,8 @@ logger = logging.getLogger(f"{namespace}-todo-frontend")
 
 app = FastAPI(lifespan=frontend.lifespan)
 
-# Mount static directory to serve JS/CSS files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# Mount static directory to serve JS/CSS files (fingerprinted + precompressed)
+app.mount("/static", frontend.static_assets, name="static")
 
 # Initialize templates pointing to your templates directory
 templates = Jinja2Templates(directory="app/templates")
@@ -6,11 +6,16 @@ import os
 import time
 import logging
 from app.cache import ImageCache
+from app.static_assets import StaticAssets, compress_response
 
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
 
+# Hash + compress static files once at startup; templates link the hashed URLs
+static_assets = StaticAssets(directory="app/static")
+templates.env.globals["static_url"] = static_assets.url_for
+
 namespace = os.getenv("POD_NAMESPACE", "default")
 logger = logging.getLogger(f"{namespace}-todo_frontend")
 
@@ -77,7 +82,7 @@ async def main_page(request: Request):
   expiry_time_str = time.ctime(cache.download_timestamp + cache.ttl) if cache.download_timestamp else 'N/A'
   last_access_str = time.ctime(cache.last_access_time) if cache.last_access_time else 'N/A'
   grace_status = "Grace period" if cache.grace_period_used else ("Valid" if cache.download_timestamp and time.time() < cache.download_timestamp + cache.ttl else "Expired")
-  return templates.TemplateResponse("index.html", {
+  response = templates.TemplateResponse("index.html", {
         # Request contains the ASGI scope and is mandatory 
         # for Jinja2 templating in FastAPI to 
         # generate correct URLs and for internal handling.
@@ -91,6 +96,7 @@ async def main_page(request: Request):
         "backend_api": backend_api,
         "namespace": namespace,
     })
+  return compress_response(response, request)
 
 @router.get("/image")
 async def get_image():
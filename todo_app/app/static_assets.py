@@ -0,0 +1,171 @@
+import os
+import gzip
+import hashlib
+import logging
+import mimetypes
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+namespace = os.getenv("POD_NAMESPACE", "default")
+logger = logging.getLogger(f"{namespace}-todo-frontend")
+
+# Fingerprinted URLs never change content, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Plain URLs stay addressable but must revalidate (cheap 304 via ETag)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Preferred order when the client accepts several encodings
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}; bad q values count as 0."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+    return weights
+
+
+def choose_encoding(accept_encoding: str, available) -> str:
+    weights = parse_accept_encoding(accept_encoding)
+    for encoding in ENCODING_PREFERENCE:
+        # An explicit entry (including q=0) beats the "*" wildcard (RFC 9110)
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if encoding in available and q > 0:
+            return encoding
+    return "identity"
+
+
+def compress(data: bytes, encoding: str, level: int = 9) -> bytes:
+    if encoding == "br":
+        # Map gzip-style level onto brotli quality (0-11)
+        return brotli.compress(data, quality=11 if level >= 9 else level)
+    if encoding == "gzip":
+        # mtime=0 keeps output (and therefore the ETag) stable across restarts
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    return data
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ENCODING_PREFERENCE if brotli is not None else ("gzip",)
+
+
+def compress_response(response: Response, request: Request, min_size: int = 500) -> Response:
+    """Compress a rendered (non-streaming) response for the requesting client."""
+    if len(response.body) < min_size:
+        return response
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), available_encodings())
+    response.headers["vary"] = "Accept-Encoding"
+    if encoding == "identity":
+        return response
+    response.body = compress(response.body, encoding, level=5)
+    response.headers["content-encoding"] = encoding
+    response.headers["content-length"] = str(len(response.body))
+    return response
+
+
+class StaticAsset:
+    def __init__(self, path: str, data: bytes):
+        self.digest = hashlib.sha256(data).hexdigest()[:12]
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.variants = {"identity": data}
+        for encoding in available_encodings():
+            compressed = compress(data, encoding)
+            # Only keep variants that actually save bytes
+            if len(compressed) < len(data):
+                self.variants[encoding] = compressed
+
+
+class StaticAssets:
+    """ASGI app serving fingerprinted, precompressed files from a directory.
+
+    Every file is read, hashed and compressed once at startup. It is served
+    both under its plain name (revalidated) and under a content-hashed name
+    like ``scripts.<hash>.js`` (cached as immutable); templates get the
+    hashed name through ``url_for``.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.assets: dict[str, StaticAsset] = {}
+        self.fingerprinted: dict[str, str] = {}
+        # url path -> (asset, immutable)
+        self.routes: dict[str, tuple[StaticAsset, bool]] = {}
+        self._load()
+
+    def _load(self):
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                full_path = os.path.join(root, filename)
+                rel_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    asset = StaticAsset(rel_path, f.read())
+                stem, ext = os.path.splitext(rel_path)
+                hashed_path = f"{stem}.{asset.digest}{ext}"
+                self.assets[rel_path] = asset
+                self.fingerprinted[rel_path] = hashed_path
+                self.routes[rel_path] = (asset, False)
+                self.routes[hashed_path] = (asset, True)
+                sizes = {enc: len(body) for enc, body in asset.variants.items()}
+                logger.info(f"Static asset {rel_path} -> {hashed_path} sizes={sizes}")
+
+    def url_for(self, path: str) -> str:
+        """Return the fingerprinted name for `path` (relative to the mount)."""
+        return self.fingerprinted.get(path, path)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        assert scope["type"] == "http"
+        request = Request(scope)
+
+        # Path relative to the mount point
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        path = path.lstrip("/")
+
+        if request.method not in ("GET", "HEAD"):
+            response = Response("Method Not Allowed", status_code=405, headers={"allow": "GET, HEAD"})
+        elif path not in self.routes:
+            response = Response("Not Found", status_code=404, media_type="text/plain")
+        else:
+            response = self._asset_response(request, *self.routes[path])
+        await response(scope, receive, send)
+
+    def _asset_response(self, request: Request, asset: StaticAsset, immutable: bool) -> Response:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""), asset.variants)
+        body = asset.variants[encoding]
+        etag = f'"{asset.digest}-{encoding}"'
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "etag": etag,
+            "vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["content-encoding"] = encoding
+
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        headers["content-length"] = str(len(body))
+        if request.method == "HEAD":
+            body = b""
+        return Response(body, headers=headers, media_type=asset.media_type)
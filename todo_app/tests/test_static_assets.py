@@ -0,0 +1,102 @@
+import gzip
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.responses import HTMLResponse
+from app.static_assets import (
+    IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, StaticAssets,
+    choose_encoding, compress_response, parse_accept_encoding,
+)
+
+SCRIPT = b"function loadTodos() { return fetch('/todos/'); }\n" * 40
+
+
+@pytest.mark.parametrize("header, available, expected", [
+    ("gzip, br", ("br", "gzip"), "br"),
+    ("gzip", ("br", "gzip"), "gzip"),
+    ("br;q=0, gzip", ("br", "gzip"), "gzip"),
+    ("gzip;q=0, *", ("gzip",), "identity"),
+    ("*", ("gzip",), "gzip"),
+    ("gzip;q=abc", ("gzip",), "identity"),
+    ("", ("gzip",), "identity"),
+    ("gzip", ("identity",), "identity"),
+])
+def test_choose_encoding(header, available, expected):
+    assert choose_encoding(header, available) == expected
+
+
+def test_parse_accept_encoding_weights():
+    assert parse_accept_encoding("GZip;q=0.5, br , *;q=0") == {"gzip": 0.5, "br": 1.0, "*": 0.0}
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / "scripts.js").write_bytes(SCRIPT)
+    return StaticAssets(directory=str(tmp_path))
+
+
+@pytest.fixture
+def client(assets):
+    app = FastAPI()
+    app.mount("/static", assets, name="static")
+    return TestClient(app)
+
+
+def test_url_for_returns_content_hashed_name(assets):
+    hashed = assets.url_for("scripts.js")
+    assert hashed.startswith("scripts.") and hashed.endswith(".js")
+    assert hashed != "scripts.js"
+    assert assets.url_for("missing.js") == "missing.js"
+
+
+def test_fingerprinted_url_is_immutable_and_compressed(client, assets):
+    resp = client.get(f"/static/{assets.url_for('scripts.js')}", headers={"accept-encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert int(resp.headers["content-length"]) < len(SCRIPT)
+    assert resp.content == SCRIPT
+
+
+def test_plain_url_revalidates_and_honours_identity(client):
+    resp = client.get("/static/scripts.js", headers={"accept-encoding": "identity"})
+    assert resp.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert "content-encoding" not in resp.headers
+    assert resp.content == SCRIPT
+
+
+def test_matching_etag_returns_304(client):
+    headers = {"accept-encoding": "gzip"}
+    etag = client.get("/static/scripts.js", headers=headers).headers["etag"]
+    resp = client.get("/static/scripts.js", headers={**headers, "if-none-match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    # The ETag is per encoding, so a different variant is not a match
+    resp = client.get("/static/scripts.js", headers={"accept-encoding": "identity", "if-none-match": etag})
+    assert resp.status_code == 200
+
+
+def test_head_and_errors(client):
+    resp = client.head("/static/scripts.js", headers={"accept-encoding": "identity"})
+    assert resp.status_code == 200
+    assert resp.headers["content-length"] == str(len(SCRIPT))
+    assert client.get("/static/missing.js").status_code == 404
+    assert client.post("/static/scripts.js").status_code == 405
+
+
+def _request(accept_encoding):
+    return Request({"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]})
+
+
+def test_compress_response_gzips_large_bodies():
+    html = "<html>" + "<p>todo</p>" * 200 + "</html>"
+    resp = compress_response(HTMLResponse(html), _request("gzip"))
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-length"] == str(len(resp.body))
+    assert gzip.decompress(resp.body).decode() == html
+
+
+def test_compress_response_skips_small_bodies():
+    resp = compress_response(HTMLResponse("<p>hi</p>"), _request("gzip"))
+    assert "content-encoding" not in resp.headers
@@ -0,0 +1,198 @@
+# app/admission.py
+# Admission control / load shedding in front of the DB-backed routes.
+# Caps in-flight requests per route class (reads vs writes) to fit inside
+# the DB pool, queues the overflow here with a deadline and answers 503 +
+# Retry-After once the queue is full, the deadline passes, or opening DB
+# connections gets slow.
+import os
+import time
+import asyncio
+import logging
+from collections import defaultdict
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from . import storage
+
+namespace = os.getenv('POD_NAMESPACE', 'default')
+logger = logging.getLogger(f"{namespace}-todo-backend")
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Probes and the metrics scrape must never be queued or shed
+EXEMPT_PATHS = {"/", "/test", "/todos/healthz", "/metrics"}
+# Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Pool connections kept free for the exempt paths (healthz ping_db)
+ADMISSION_POOL_RESERVE = int(os.getenv("ADMISSION_POOL_RESERVE", "1"))
+# In-flight caps default to the DB pool capacity minus that reserve (2/3
+# reads, 1/3 writes) so admitted requests never queue on a pool checkout
+POOL_CAPACITY = max(
+    2, storage.DB_POOL_SIZE + storage.DB_POOL_MAX_OVERFLOW - ADMISSION_POOL_RESERVE
+)
+ADMISSION_WRITE_MAX_IN_FLIGHT = int(
+    os.getenv("ADMISSION_WRITE_MAX_IN_FLIGHT", str(max(1, POOL_CAPACITY // 3)))
+)
+ADMISSION_READ_MAX_IN_FLIGHT = int(
+    os.getenv("ADMISSION_READ_MAX_IN_FLIGHT", str(max(1, POOL_CAPACITY - ADMISSION_WRITE_MAX_IN_FLIGHT)))
+)
+if ADMISSION_READ_MAX_IN_FLIGHT + ADMISSION_WRITE_MAX_IN_FLIGHT > POOL_CAPACITY:
+    # Scale explicit settings down proportionally to fit the pool
+    total = ADMISSION_READ_MAX_IN_FLIGHT + ADMISSION_WRITE_MAX_IN_FLIGHT
+    logger.warning(
+        "Admission limits (read=%d, write=%d) exceed DB pool capacity %d; scaling down",
+        ADMISSION_READ_MAX_IN_FLIGHT, ADMISSION_WRITE_MAX_IN_FLIGHT, POOL_CAPACITY,
+    )
+    ADMISSION_READ_MAX_IN_FLIGHT = max(1, ADMISSION_READ_MAX_IN_FLIGHT * POOL_CAPACITY // total)
+    ADMISSION_WRITE_MAX_IN_FLIGHT = max(1, POOL_CAPACITY - ADMISSION_READ_MAX_IN_FLIGHT)
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "50"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+# Smoothed pool checkout time above which queued requests are shed. Since
+# admitted requests fit in the pool, this tracks how long it takes to open
+# (or get back) a DB connection, i.e. a DB slow to accept connections,
+# rather than requests waiting for a free pool slot.
+ADMISSION_MAX_POOL_WAIT = float(os.getenv("ADMISSION_MAX_POOL_WAIT", "0.5"))
+ADMISSION_RETRY_AFTER = storage.RETRY_AFTER_SECONDS
+
+
+class RouteClassLimiter:
+    """Concurrency limit with a bounded, deadline-aware wait queue."""
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.queue_wait_sum = 0.0
+        self.queue_wait_count = 0
+        self.decisions: dict[str, int] = defaultdict(int)
+        self._sem = asyncio.Semaphore(max_in_flight)
+
+    async def acquire(self) -> str | None:
+        """Take a slot; return None when admitted, otherwise the shed reason."""
+        if not self._sem.locked():
+            await self._sem.acquire()
+            return self._admit("admitted")
+
+        # Would have to queue: shed early if DB connections are slow to open
+        if storage.pool_wait_ewma > ADMISSION_MAX_POOL_WAIT:
+            return self._shed("pool_wait")
+        if self.queued >= self.max_queue:
+            return self._shed("queue_full")
+
+        self.queued += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return self._shed("queue_timeout")
+        finally:
+            self.queued -= 1
+            self.queue_wait_sum += time.monotonic() - started
+            self.queue_wait_count += 1
+        return self._admit("admitted_queued")
+
+    def release(self):
+        self.in_flight -= 1
+        self._sem.release()
+
+    def _admit(self, decision: str) -> None:
+        self.in_flight += 1
+        self.decisions[decision] += 1
+        return None
+
+    def _shed(self, reason: str) -> str:
+        self.decisions[f"shed_{reason}"] += 1
+        return reason
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware so shed requests never reach routing or the DB."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.limiters = {
+            "read": RouteClassLimiter(
+                "read", ADMISSION_READ_MAX_IN_FLIGHT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT
+            ),
+            "write": RouteClassLimiter(
+                "write", ADMISSION_WRITE_MAX_IN_FLIGHT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT
+            ),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == "/metrics":
+            response = PlainTextResponse(self.render_metrics(), media_type=METRICS_CONTENT_TYPE)
+            await response(scope, receive, send)
+            return
+        if scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = "read" if scope["method"] in READ_METHODS else "write"
+        limiter = self.limiters[route_class]
+        reason = await limiter.acquire()
+        if reason is not None:
+            logger.warning(
+                "todo_request_shed",
+                extra={
+                    "endpoint": scope["path"],
+                    "method": scope["method"],
+                    "route_class": route_class,
+                    "reason": reason,
+                    "status": "rejected_503",
+                },
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": f"Server overloaded ({reason}), retry later"},
+                headers={"Retry-After": str(ADMISSION_RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    def render_metrics(self) -> str:
+        """Prometheus text exposition of admission decisions and pool state."""
+        # Each metric family is one contiguous group, TYPE line first
+        lines = ["# TYPE todo_admission_decisions_total counter"]
+        for name, limiter in self.limiters.items():
+            for decision, count in sorted(limiter.decisions.items()):
+                lines.append(
+                    f'todo_admission_decisions_total{{route_class="{name}",decision="{decision}"}} {count}'
+                )
+        lines.append("# TYPE todo_admission_in_flight gauge")
+        for name, limiter in self.limiters.items():
+            lines.append(f'todo_admission_in_flight{{route_class="{name}"}} {limiter.in_flight}')
+        lines.append("# TYPE todo_admission_queued gauge")
+        for name, limiter in self.limiters.items():
+            lines.append(f'todo_admission_queued{{route_class="{name}"}} {limiter.queued}')
+        lines.append("# TYPE todo_admission_queue_wait_seconds summary")
+        for name, limiter in self.limiters.items():
+            lines.append(
+                f'todo_admission_queue_wait_seconds_sum{{route_class="{name}"}} {limiter.queue_wait_sum:.6f}'
+            )
+            lines.append(
+                f'todo_admission_queue_wait_seconds_count{{route_class="{name}"}} {limiter.queue_wait_count}'
+            )
+
+        pool = storage.get_pool_stats()
+        lines += [
+            "# TYPE todo_db_pool_size gauge",
+            f"todo_db_pool_size {pool['size']}",
+            "# TYPE todo_db_pool_checked_out gauge",
+            f"todo_db_pool_checked_out {pool['checked_out']}",
+            "# TYPE todo_db_pool_overflow gauge",
+            f"todo_db_pool_overflow {pool['overflow']}",
+            "# TYPE todo_db_pool_wait_seconds gauge",
+            f"todo_db_pool_wait_seconds {pool['wait_seconds']:.6f}",
+        ]
+        return "\n".join(lines) + "\n"
@@ -24,7 +24,8 @@ namespace = os.getenv('POD_NAMESPACE', 'default')
 logger = logging.getLogger(f"{namespace}-todo-backend")
 
 # Local app code inherit the logging config set above
-from .storage import init_db, engine
+from .storage import init_db, close_db
+from .admission import AdmissionControlMiddleware
 from .routes import todos
 
 
@@ -49,17 +50,22 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     logger.warning("todo_http_error", extra={"status_code": exc.status_code})
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    return JSONResponse(
+        status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers
+    )
 
 # 4. LIFESPAN & MIDDLEWARE
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
     yield
-    await engine.dispose()
+    await close_db()
 
 app.router.lifespan_context = lifespan  # FastAPI v0.100+
 
+# Added before CORS so shed 503s still carry CORS headers
+app.add_middleware(AdmissionControlMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -102,3 +108,7 @@ async def test():
 # Store:  Add todo to storage
 #   Calls storage.py:add_todo to add new todo to in-memory list.
 # Return: 201 Created JSON response on success.
+
+# GET /metrics:
+# Handler: app/admission.py:AdmissionControlMiddleware.render_metrics
+# Returns: Prometheus text with admission decisions and DB pool stats.
@@ -7,6 +7,11 @@ from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
+# Bump when a new table is added below; startup only runs create_all when
+# the version recorded in the database is older than this. create_all never
+# alters existing tables, so column changes need a real migration instead.
+SCHEMA_VERSION = 1
+
 # SQLAlchemy 2.0+ model
 class Base(AsyncAttrs, DeclarativeBase):
     __abstract__ = True
@@ -20,6 +25,12 @@ class TodoDB(Base):
     completed: Mapped[bool] = mapped_column(default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    applied_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
 class TodoCreate(BaseModel):
     # Enforces the 140-char limit
     # FastAPI returns `422 Unprocessable Entity`
@@ -1,9 +1,16 @@
 # app/nats_client.py
 import os
 import json
+import time
+import uuid
 import nats
 import logging
 
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; events fall back to JSON
+    msgpack = None
+
 
 NATS_URL = os.getenv("NATS_URL", "nats://127.0.0.1:4222")
 namespace = os.getenv('POD_NAMESPACE', 'default')
@@ -13,16 +20,60 @@ logger = logging.getLogger(f"{namespace}-todo-backend")
 NATS_SUBJECT_CREATED = f"{namespace}.todos.created"
 NATS_SUBJECT_UPDATED = f"{namespace}.todos.updated"
 
+# Event envelope: {"v", "id", "type", "ts", "data"}, carried only in the
+# body. Bump the version on any incompatible change to the envelope or the
+# todo payload, including the msgpack field order below.
+EVENT_SCHEMA_VERSION = 1
+# msgpack packs the envelope and todo positionally in this order (v1)
+ENVELOPE_FIELDS = ("v", "id", "type", "ts", "data")
+TODO_FIELDS = ("id", "text", "completed", "created_at")
+
+# Body encoding. This is a producer-side switch, not a negotiation: every
+# consumer must be able to decode msgpack before it is turned on. JSON
+# bodies are published without headers (consumers default to JSON);
+# msgpack bodies carry a single Content-Type header.
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+NATS_EVENT_ENCODING = os.getenv("NATS_EVENT_ENCODING", "json")  # json | msgpack
+if NATS_EVENT_ENCODING == "msgpack" and msgpack is None:
+    logger.warning("NATS_EVENT_ENCODING=msgpack but msgpack is not installed; using json")
+
+def build_event(subject: str, payload: dict) -> dict:
+    # "<namespace>.todos.created" -> "todo.created"
+    action = subject.rsplit(".", 1)[-1]
+    return {
+        "v": EVENT_SCHEMA_VERSION,
+        "id": uuid.uuid4(),
+        "type": f"todo.{action}",
+        "ts": time.time(),  # publish time, lets consumers measure end-to-end lag
+        "data": payload,
+    }
+
+def encode_event(event: dict) -> tuple[bytes, dict | None]:
+    """Return (body, headers) for the configured encoding."""
+    if NATS_EVENT_ENCODING == "msgpack" and msgpack is not None:
+        # Positional arrays, raw 16-byte id, tz-aware datetimes as msgpack timestamps
+        packed = {
+            **event,
+            "id": event["id"].bytes,
+            "data": [event["data"].get(field) for field in TODO_FIELDS],
+        }
+        body = msgpack.packb([packed[field] for field in ENVELOPE_FIELDS], datetime=True, default=str)
+        return body, {"Content-Type": CONTENT_TYPE_MSGPACK}
+    body = json.dumps({**event, "id": event["id"].hex}, default=str, separators=(",", ":"))
+    return body.encode("utf-8"), None
+
 # Simple, connect-per-publish POC
 async def publish_todo_event(subject: str, payload: dict):
     try:
         logger.info(f"Connecting to NATS at {NATS_URL}")
         nc = await nats.connect(servers=[NATS_URL])
-        payload_bytes = json.dumps(payload, default=str).encode("utf-8")
-        await nc.publish(subject, payload_bytes)
-        #await nc.publish(subject, json.dumps(payload).encode("utf-8"))
+        event = build_event(subject, payload)
+        payload_bytes, headers = encode_event(event)
+        await nc.publish(subject, payload_bytes, headers=headers)
         await nc.drain()
-        logger.info(f"Published to NATS {subject}: {payload}")
+        logger.info(
+            f"Published to NATS {subject}: id={event['id'].hex} type={event['type']} "
+            f"{len(payload_bytes)} bytes"
+        )
     except Exception as e:
         logger.error(f"Failed to publish to NATS: {e}")
-
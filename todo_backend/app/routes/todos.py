@@ -2,10 +2,10 @@ import asyncio
 from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 from ..models import TodoCreate, TodoResponse, TodoUpdate, MessageResponse
 from ..storage import (
-    get_todos, create_todo, get_todo, update_todo, delete_todo, get_db_session
+    get_todos, create_todo, get_todo, update_todo, delete_todo, get_db_session,
+    get_db_status, ping_db
 )
 from ..nats_client import (
     publish_todo_event, NATS_SUBJECT_CREATED, NATS_SUBJECT_UPDATED
@@ -25,9 +25,14 @@ logger = logging.getLogger(f"{namespace}-todo-backend")
 router = APIRouter(prefix="/todos", tags=["todos"])
 
 @router.get("/healthz")
-async def healthz(db: AsyncSession = Depends(get_db_session)):
+async def healthz():
+    status = get_db_status()
+    if not status["ready"]:
+        # Schema check / pool warm-up still retrying in the background
+        logger.debug(f"healthz: todo backend db starting {status}")
+        raise HTTPException(503, f"Todo DB starting (attempt {status['attempts']})")
     try:
-        await db.execute(text("SELECT 1"))
+        await ping_db()
         logger.debug("healthz: todo backend db connection responsive")
         return {"status": "healthzy"}
     except Exception as e:
@@ -1,20 +1,50 @@
 import os
 import asyncio
 import logging
+import random
+import time
+from contextlib import AsyncExitStack, suppress
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, and_
-from .models import Base, TodoDB, TodoCreate, TodoResponse, TodoUpdate
+from sqlalchemy import select, and_, func, inspect, text
+from fastapi import HTTPException
+from .models import Base, SchemaVersion, SCHEMA_VERSION, TodoDB, TodoCreate, TodoResponse, TodoUpdate
 
 namespace = os.getenv('POD_NAMESPACE', 'default')
 logger = logging.getLogger(f"{namespace}-todo-backend")
 
+# Pool sizing and startup tuning
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+# Upper bound on a single checkout wait (SQLAlchemy default is 30s)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+# Connections opened (and hot queries prepared on) before reporting ready
+DB_POOL_MIN_SIZE = min(int(os.getenv("DB_POOL_MIN_SIZE", "2")), DB_POOL_SIZE)
+# Exponential backoff between readiness attempts: base * 2^attempt, capped
+DB_INIT_BASE_DELAY = float(os.getenv("DB_INIT_BASE_DELAY", "0.5"))
+DB_INIT_MAX_DELAY = float(os.getenv("DB_INIT_MAX_DELAY", "15"))
 
+# Retry-After (seconds) on every overload 503, shared with admission control
+RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+# Arbitrary key so only one pod at a time runs schema DDL
+SCHEMA_LOCK_ID = 72_640_026
 
 # Globals
 engine: AsyncEngine | None = None
 AsyncSessionLocal: sessionmaker | None = None
 
+# Readiness state, reported through /todos/healthz
+db_ready: bool = False
+db_init_attempts: int = 0
+db_last_error: str | None = None
+_init_task: asyncio.Task | None = None
+
+# Smoothed pool checkout time (mostly connect latency once admission caps
+# fit the pool), read by admission control
+POOL_WAIT_EWMA_ALPHA = 0.2
+pool_wait_ewma: float = 0.0
+
 def get_required_env(var_name: str, default: str = None) -> str:
     """Check if env var exists, log status, return value or default"""
     if var_name in os.environ:
@@ -36,21 +66,104 @@ def build_db_url() -> str:
     logger.info("storage.py: Final DB URL: %s", url)
     return url
 
+# Hot queries: built in one place so the warm-up prepares exactly the
+# statements the routes execute (asyncpg caches them per connection).
+def todos_query():
+    return select(TodoDB).order_by(TodoDB.created_at.desc())
+
+def todo_by_id_query(todo_id: int):
+    return select(TodoDB).where(TodoDB.id == todo_id)
+
+def _read_schema_version(sync_conn) -> int | None:
+    if not inspect(sync_conn).has_table(SchemaVersion.__tablename__, schema="public"):
+        return None
+    return sync_conn.execute(select(func.max(SchemaVersion.version))).scalar()
+
+async def ensure_schema():
+    """Create missing tables only when the recorded version is behind SCHEMA_VERSION.
+
+    This is create_all, not a migration: existing tables are never altered.
+    """
+    async with engine.connect() as conn:
+        current = await conn.run_sync(_read_schema_version)
+    if current is not None and current >= SCHEMA_VERSION:
+        logger.info("Schema version %d is current; skipping DDL", current)
+        return
+
+    async with engine.begin() as conn:
+        # Serialize DDL across pods; re-check once the lock is held
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+        current = await conn.run_sync(_read_schema_version)
+        if current is not None and current >= SCHEMA_VERSION:
+            logger.info("Schema migrated to version %d by another pod", current)
+            return
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(SchemaVersion.__table__.insert().values(version=SCHEMA_VERSION))
+    logger.info("Schema upgraded from version %s to %d", current, SCHEMA_VERSION)
+
+async def prewarm_pool():
+    """Open DB_POOL_MIN_SIZE connections and prepare the hot queries on each."""
+    async with AsyncExitStack() as stack:
+        # Hold every connection at once so the pool has to open distinct ones
+        conns = [
+            await stack.enter_async_context(engine.connect())
+            for _ in range(DB_POOL_MIN_SIZE)
+        ]
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(todos_query())
+            await conn.execute(todo_by_id_query(0))
+    logger.info("DB pool pre-warmed with %d connections", len(conns))
+
+async def wait_for_db():
+    """Bring schema and pool up, retrying with exponential backoff until ready."""
+    global db_ready, db_init_attempts, db_last_error
+
+    while True:
+        db_init_attempts += 1
+        try:
+            await ensure_schema()
+            await prewarm_pool()
+            db_ready = True
+            db_last_error = None
+            logger.info("Database ready after %d attempt(s)", db_init_attempts)
+            return
+        except Exception as e:
+            db_last_error = str(e)
+            # Cap the exponent first: 2 ** ~1100 overflows a float after a long outage
+            backoff = DB_INIT_BASE_DELAY * 2 ** min(db_init_attempts - 1, 16)
+            delay = min(DB_INIT_MAX_DELAY, backoff)
+            delay *= random.uniform(0.8, 1.2)  # jitter so pods don't retry in lockstep
+            # avoid f-strings in log calls so interpolation is lazy
+            logger.warning(
+                "Database startup: attempt %d failed: %s; retrying in %.1fs",
+                db_init_attempts, e, delay,
+            )
+            # App keeps serving; readiness probe `/todos/healthz` returns 503 until ready
+            await asyncio.sleep(delay)
+
+def get_db_status() -> dict:
+    return {
+        "ready": db_ready,
+        "attempts": db_init_attempts,
+        "last_error": db_last_error,
+    }
+
 async def init_db():
-    """Create tables on startup with graceful retries."""
-    global engine, AsyncSessionLocal
+    """Create the engine and start schema check / pool warm-up in the background."""
+    global engine, AsyncSessionLocal, _init_task
 
     if engine is not None and AsyncSessionLocal is not None:
         return
 
-    # async with engine.begin() as conn:
-    #     await conn.run_sync(Base.metadata.create_all)
-    # logger.info("storage.py: Database tables created")
     db_url = build_db_url()
     engine = create_async_engine(
         db_url,
         echo=False,        # THIS SUPPRESSES ALL SQL LOGS
         echo_pool=False,   # NO pool logs
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_POOL_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
         future=True
     )
     AsyncSessionLocal = sessionmaker(
@@ -60,43 +173,64 @@ async def init_db():
         autoflush=False,
         autocommit=False
     )
+    # Don't block startup on the DB: the pod serves 503 on healthz until ready
+    _init_task = asyncio.create_task(wait_for_db())
 
-    max_retries = 3
-    retry_delay = 1
-    for attempt in range(max_retries):
-        try:
-            async with engine.begin() as conn:
-                await conn.run_sync(Base.metadata.create_all)
-            logger.info("Database ready!")
-            return # success - normal startup
-        except Exception as e:
-            # avoid f-strings in log calls so interpolation is lazy)
-            #logger.warning(f"Database Table Creation: Attempt {attempt+1}/{max_retries} failed: {e}")
-            logger.warning(
-                "Database Table Creation: Attempt %d/%d failed: %s",
-                attempt + 1, max_retries, e,
-            )
-            #if attempt == max_retries - 1:
-                # No raise after last attempt in startup context to avoid crash
-                # raise
-                # App continues to run;
-                # later readiness probe `/todos/healthz` returns 503 if db still didn't comeup
-            await asyncio.sleep(retry_delay)
+async def close_db():
+    global engine, AsyncSessionLocal, _init_task
+    if _init_task is not None and not _init_task.done():
+        _init_task.cancel()
+        # Let a warm-up stuck in engine.connect() unwind before disposing
+        with suppress(asyncio.CancelledError):
+            await _init_task
+    _init_task = None
+    if engine is not None:
+        await engine.dispose()
+    engine = None
+    AsyncSessionLocal = None
+
+async def ping_db():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+def record_pool_wait(seconds: float):
+    global pool_wait_ewma
+    pool_wait_ewma += POOL_WAIT_EWMA_ALPHA * (seconds - pool_wait_ewma)
 
-    # After all retries, log and give up, but DO NOT crash the app
-    logger.error("Database not ready after max retries; continuing without DB")
+def get_pool_stats() -> dict:
+    """Pool occupancy and smoothed checkout wait, for admission control / metrics."""
+    pool = engine.pool if engine is not None else None
+    return {
+        "size": pool.size() if pool is not None else 0,
+        "checked_out": pool.checkedout() if pool is not None else 0,
+        "overflow": pool.overflow() if pool is not None else 0,
+        "wait_seconds": pool_wait_ewma,
+    }
 
 async def get_db_session() -> AsyncSession:
     if AsyncSessionLocal is None:
         raise RuntimeError("AsyncSessionLocal is not initialized. Call init_db() first.")    
     async with AsyncSessionLocal() as session:
         try:
+            # Check out the connection up front so pool wait time is measurable
+            started = time.monotonic()
+            try:
+                await session.connection()
+            except Exception as e:
+                logger.error("DB connection checkout failed: %s", e)
+                raise HTTPException(
+                    503, "Todo DB not available",
+                    headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+                )
+            finally:
+                # Record timeouts too: those are the waits that should trigger shedding
+                record_pool_wait(time.monotonic() - started)
             yield session
         finally:
             await session.close()
 
 async def get_todos(db: AsyncSession) -> list[TodoResponse]:
-    result = await db.execute(select(TodoDB).order_by(TodoDB.created_at.desc()))
+    result = await db.execute(todos_query())
     todos = result.scalars().all()
     return [TodoResponse.model_validate(todo) for todo in todos]
 
@@ -109,7 +243,7 @@ async def create_todo(db: AsyncSession, todo: TodoCreate) -> TodoResponse:
 
 async def get_todo(db: AsyncSession, todo_id: int) -> TodoDB:
     """Return ORM TodoDB instance or raise."""
-    result = await db.execute(select(TodoDB).where(TodoDB.id == todo_id))
+    result = await db.execute(todo_by_id_query(todo_id))
     todo = result.scalar_one_or_none()
     if not todo:
         raise ValueError(f"Todo {todo_id} not found")
@@ -129,7 +263,7 @@ async def update_todo(db: AsyncSession, todo_id: int, update_data: TodoUpdate) -
     return TodoResponse.model_validate(todo)
 
 async def delete_todo(db: AsyncSession, todo_id: int) -> bool:
-    result = await db.execute(select(TodoDB).where(TodoDB.id == todo_id))
+    result = await db.execute(todo_by_id_query(todo_id))
     todo = result.scalar_one_or_none()
     if not todo:
         return False
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from app import admission, storage
+from app.admission import AdmissionControlMiddleware, RouteClassLimiter
+
+
+@pytest.fixture(autouse=True)
+def reset_pool_wait(monkeypatch):
+    monkeypatch.setattr(storage, "pool_wait_ewma", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_admits_without_queueing_below_limit():
+    limiter = RouteClassLimiter("read", max_in_flight=2, max_queue=1, queue_timeout=1)
+    assert await limiter.acquire() is None
+    assert await limiter.acquire() is None
+    assert limiter.in_flight == 2
+    assert limiter.decisions == {"admitted": 2}
+
+
+@pytest.mark.asyncio
+async def test_queued_request_admitted_after_release():
+    limiter = RouteClassLimiter("write", max_in_flight=1, max_queue=1, queue_timeout=1)
+    assert await limiter.acquire() is None
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    limiter.release()
+    assert await waiter is None
+    assert limiter.queued == 0
+    assert limiter.in_flight == 1
+    assert limiter.decisions["admitted_queued"] == 1
+    assert limiter.queue_wait_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sheds_on_queue_timeout():
+    limiter = RouteClassLimiter("read", max_in_flight=1, max_queue=1, queue_timeout=0.01)
+    await limiter.acquire()
+    assert await limiter.acquire() == "queue_timeout"
+    assert limiter.queued == 0
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_queue_full():
+    limiter = RouteClassLimiter("read", max_in_flight=1, max_queue=0, queue_timeout=1)
+    await limiter.acquire()
+    assert await limiter.acquire() == "queue_full"
+    assert limiter.decisions["shed_queue_full"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sheds_on_pool_wait_only_when_it_would_queue(monkeypatch):
+    monkeypatch.setattr(storage, "pool_wait_ewma", admission.ADMISSION_MAX_POOL_WAIT + 1)
+    limiter = RouteClassLimiter("read", max_in_flight=1, max_queue=10, queue_timeout=1)
+    # A free slot is still handed out so the pool wait signal keeps updating
+    assert await limiter.acquire() is None
+    assert await limiter.acquire() == "pool_wait"
+
+
+def test_pool_wait_recorded_as_ewma(monkeypatch):
+    storage.record_pool_wait(1.0)
+    assert storage.pool_wait_ewma == pytest.approx(storage.POOL_WAIT_EWMA_ALPHA)
+
+
+def test_limits_fit_pool_with_probe_reserve():
+    total = admission.ADMISSION_READ_MAX_IN_FLIGHT + admission.ADMISSION_WRITE_MAX_IN_FLIGHT
+    assert total <= admission.POOL_CAPACITY
+    assert admission.POOL_CAPACITY < storage.DB_POOL_SIZE + storage.DB_POOL_MAX_OVERFLOW
+
+
+def test_metrics_families_are_contiguous_with_type_first():
+    middleware = AdmissionControlMiddleware(app=None)
+    middleware.limiters["read"].decisions["admitted"] = 3
+    middleware.limiters["write"].decisions["shed_queue_full"] = 1
+
+    families = []
+    for line in middleware.render_metrics().splitlines():
+        if line.startswith("# TYPE "):
+            families.append(line.split()[2])
+            continue
+        name = line.split("{")[0].split(" ")[0]
+        # Every sample belongs to the family whose TYPE line came last
+        assert name.startswith(families[-1].removesuffix("_total")), line
+    assert len(families) == len(set(families))
+    assert "todo_admission_decisions_total" in families
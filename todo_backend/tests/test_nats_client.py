@@ -0,0 +1,50 @@
+import json
+import uuid
+from datetime import datetime, timezone
+import msgpack
+import pytest
+from app import nats_client
+
+TODO = {
+    "id": 1,
+    "text": "Buy groceries",
+    "completed": False,
+    "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+}
+
+
+def test_build_event_envelope():
+    event = nats_client.build_event(nats_client.NATS_SUBJECT_CREATED, TODO)
+    assert event["v"] == nats_client.EVENT_SCHEMA_VERSION
+    assert event["type"] == "todo.created"
+    assert isinstance(event["id"], uuid.UUID)
+    assert event["data"] is TODO
+
+
+def test_json_encoding_has_no_headers(monkeypatch):
+    monkeypatch.setattr(nats_client, "NATS_EVENT_ENCODING", "json")
+    event = nats_client.build_event(nats_client.NATS_SUBJECT_UPDATED, TODO)
+    body, headers = nats_client.encode_event(event)
+
+    assert headers is None
+    decoded = json.loads(body)
+    assert decoded["id"] == event["id"].hex
+    assert decoded["type"] == "todo.updated"
+    assert decoded["data"]["created_at"] == str(TODO["created_at"])
+
+
+def test_msgpack_encoding_is_positional(monkeypatch):
+    monkeypatch.setattr(nats_client, "NATS_EVENT_ENCODING", "msgpack")
+    event = nats_client.build_event(nats_client.NATS_SUBJECT_CREATED, TODO)
+    body, headers = nats_client.encode_event(event)
+
+    assert headers == {"Content-Type": nats_client.CONTENT_TYPE_MSGPACK}
+    packed = msgpack.unpackb(body, timestamp=3)
+    envelope = dict(zip(nats_client.ENVELOPE_FIELDS, packed))
+    assert len(packed) == len(nats_client.ENVELOPE_FIELDS)
+    assert envelope["id"] == event["id"].bytes
+    assert envelope["ts"] == pytest.approx(event["ts"])
+    assert dict(zip(nats_client.TODO_FIELDS, envelope["data"])) == TODO
+    # Smaller than the same event as JSON
+    monkeypatch.setattr(nats_client, "NATS_EVENT_ENCODING", "json")
+    assert len(body) < len(nats_client.encode_event(event)[0])